@@ -10,6 +10,10 @@ __metaclass__ = type
 import traceback
 import re
 import time
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
 from ansible.module_utils.basic import missing_required_lib
 
 COCKROACHDB_IMP_ERR = None
@@ -17,15 +21,74 @@ try:
     import psycopg2
     from psycopg2 import sql
     from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+    from psycopg2.pool import ThreadedConnectionPool
     HAS_PSYCOPG2 = True
 except ImportError:
     COCKROACHDB_IMP_ERR = traceback.format_exc()
     HAS_PSYCOPG2 = False
 
+# SQLSTATE codes of undefined_table and undefined_column errors, see execute_query's missing_ok
+UNDEFINED_OBJECT_CODES = frozenset(('42P01', '42703'))
+
+# Unquoted SQL identifier; used with fullmatch so a trailing newline is rejected too
+IDENTIFIER_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+
 # Use to validate identifiers to avoid SQL injection
 def is_valid_identifier(identifier):
     """Check if the identifier is valid to avoid SQL injection"""
-    return bool(re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', identifier))
+    return bool(IDENTIFIER_RE.fullmatch(identifier))
+
+class CockroachDBError(Exception):
+    """Raised instead of failing the module by helpers that must not exit, e.g. in worker threads"""
+
+
+def parse_version(version_str):
+    """Extract the version number from the output of SELECT version()"""
+    version_match = re.search(r'CockroachDB v([0-9.]+)', version_str or '')
+    if version_match:
+        return version_match.group(1)
+    return None
+
+def build_partition_info(rows):
+    """
+    Build the partitioning details of a table from crdb_internal.table_partitions rows
+
+    Args:
+        rows: (partition_name, partition_method, partition_expression, partition_value)
+              rows ordered by partition_ordinal_position
+
+    Returns:
+        Dictionary with partition_type, partition_columns and partitions keys
+    """
+    partitions = []
+    partition_type = None
+    partition_columns = None
+
+    for row in rows:
+        part_name = row[0]
+        part_method = row[1]  # HASH, RANGE, LIST
+        part_expr = row[2]    # Columns used for partitioning
+        part_value = row[3]   # Values for the partition
+
+        # Extract column names from expression
+        if not partition_columns and part_expr:
+            # Simple parsing, assumes format like: "region" or "(region, country)"
+            columns_str = part_expr.strip('()')
+            partition_columns = [col.strip() for col in columns_str.split(',')]
+
+        if not partition_type and part_method:
+            partition_type = part_method
+
+        partitions.append({
+            'name': part_name,
+            'values': part_value,
+        })
+
+    return {
+        'partition_type': partition_type,
+        'partition_columns': partition_columns,
+        'partitions': partitions
+    }
 
 class CockroachDBHelper(object):
     """
@@ -45,38 +108,65 @@ class CockroachDBHelper(object):
         self.ssl_rootcert = module.params.get('ssl_rootcert')
         self.conn_timeout = module.params.get('connect_timeout', 30)
         self.conn = None
+        self.pool = None
+        self.raise_errors = False
+        # Existence checks already answered on this helper, see database_exists and table_exists
+        self._database_exists_cache = {}
+        self._table_exists_cache = {}
+        self._build_info = None
+
+    def _connection_params(self):
+        """
+        Build the psycopg2 connection parameters from the module parameters
+        """
+        conn_params = dict(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            dbname=self.database,
+            connect_timeout=self.conn_timeout,
+            application_name='ansible_cockroachdb',  # Identify the connection in logs
+        )
+
+        if self.password:
+            conn_params['password'] = self.password
+
+        if self.ssl_mode:
+            conn_params['sslmode'] = self.ssl_mode
+
+        if self.ssl_cert:
+            conn_params['sslcert'] = self.ssl_cert
+
+        if self.ssl_key:
+            conn_params['sslkey'] = self.ssl_key
+
+        if self.ssl_rootcert:
+            conn_params['sslrootcert'] = self.ssl_rootcert
+
+        return conn_params
+
+    def _fail(self, msg):
+        """
+        Fail the module, or raise CockroachDBError if this helper must not exit
+        """
+        if self.raise_errors:
+            raise CockroachDBError(msg)
+        self.module.fail_json(msg=msg)
 
     def connect(self):
         """
         Connect to CockroachDB instance
+
+        An already open connection is reused rather than replaced.
         """
         if not HAS_PSYCOPG2:
             self.module.fail_json(msg=missing_required_lib("psycopg2"), exception=COCKROACHDB_IMP_ERR)
 
-        try:
-            conn_params = dict(
-                host=self.host,
-                port=self.port,
-                user=self.user,
-                dbname=self.database,
-                connect_timeout=self.conn_timeout,
-                application_name='ansible_cockroachdb',  # Identify the connection in logs
-            )
-
-            if self.password:
-                conn_params['password'] = self.password
-
-            if self.ssl_mode:
-                conn_params['sslmode'] = self.ssl_mode
-
-            if self.ssl_cert:
-                conn_params['sslcert'] = self.ssl_cert
-
-            if self.ssl_key:
-                conn_params['sslkey'] = self.ssl_key
+        if self.conn and not self.conn.closed:
+            return self.conn
 
-            if self.ssl_rootcert:
-                conn_params['sslrootcert'] = self.ssl_rootcert
+        try:
+            conn_params = self._connection_params()
 
             # Attempt to connect with retries for transient network issues
             retries = 3
@@ -86,11 +176,9 @@ class CockroachDBHelper(object):
             for attempt in range(retries):
                 try:
                     self.conn = psycopg2.connect(**conn_params)
+                    # psycopg2.connect has already completed the handshake, so the
+                    # first real query doubles as the health check
                     self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-                    # Test the connection with a simple query
-                    cursor = self.conn.cursor()
-                    cursor.execute("SELECT 1")
-                    cursor.close()
                     return self.conn
                 except psycopg2.OperationalError as e:
                     last_error = e
@@ -107,7 +195,8 @@ class CockroachDBHelper(object):
         except Exception as e:
             self.module.fail_json(msg="Unable to connect to CockroachDB: %s" % str(e))
 
-    def execute_query(self, query, params=None, fail_on_error=True, system_tables=False, fetch=True):
+    def execute_query(self, query, params=None, fail_on_error=True, system_tables=False, fetch=True,
+                      missing_ok=False):
         """
         Execute a SQL query and return the results
 
@@ -118,6 +207,8 @@ class CockroachDBHelper(object):
             system_tables: Whether this query is accessing system tables (default: False)
                            If True, will not fail on "table does not exist" errors
             fetch: Whether to fetch and return results (default: True)
+            missing_ok: Whether to return None instead of failing when the query references
+                        an undefined table or column, e.g. one missing from this version (default: False)
         """
         try:
             if not self.conn:
@@ -136,49 +227,154 @@ class CockroachDBHelper(object):
             finally:
                 cursor.close()
         except psycopg2.Error as e:
-            # Handle common CockroachDB errors with better messages
-            error_message = str(e)
+            if missing_ok and e.pgcode in UNDEFINED_OBJECT_CODES:
+                return None
+            return self._query_error(e, fail_on_error, system_tables)
+        except Exception as e:
+            if not fail_on_error:
+                return None
+            self._fail(f"Unexpected error executing query: {str(e)}")
+
+    def _query_error(self, e, fail_on_error, system_tables):
+        """
+        Handle a psycopg2 error raised by a query
 
-            # Special handling for system table queries - allows for version differences
-            if system_tables and ("does not exist" in error_message and
-                                  ("relation" in error_message or "table" in error_message)):
-                if not fail_on_error:
-                    return None
+        Returns None when fail_on_error is False, otherwise fails with a message
+        describing the common CockroachDB error cases.
+        """
+        # Handle common CockroachDB errors with better messages
+        error_message = str(e)
 
+        # Special handling for system table queries - allows for version differences
+        if system_tables and ("does not exist" in error_message and
+                              ("relation" in error_message or "table" in error_message)):
             if not fail_on_error:
                 return None
 
-            if "does not exist" in error_message:
-                if "database" in error_message:
-                    self.module.fail_json(msg=f"Database does not exist: {error_message}")
-                elif "relation" in error_message or "table" in error_message:
-                    self.module.fail_json(msg=f"Table does not exist: {error_message}")
-                elif "role" in error_message:
-                    self.module.fail_json(msg=f"Role does not exist: {error_message}")
-                else:
-                    self.module.fail_json(msg=f"Object does not exist: {error_message}")
-            elif "unknown setting" in error_message:
-                self.module.fail_json(msg=f"Unknown setting: {error_message}")
-            elif "already exists" in error_message:
-                self.module.fail_json(msg=f"Object already exists: {error_message}")
-            elif "permission denied" in error_message:
-                self.module.fail_json(msg=f"Permission denied: {error_message}")
-            elif "syntax error" in error_message:
-                self.module.fail_json(msg=f"SQL syntax error: {error_message}")
+        if not fail_on_error:
+            return None
+
+        if "does not exist" in error_message:
+            if "database" in error_message:
+                self._fail(f"Database does not exist: {error_message}")
+            elif "relation" in error_message or "table" in error_message:
+                self._fail(f"Table does not exist: {error_message}")
+            elif "role" in error_message:
+                self._fail(f"Role does not exist: {error_message}")
             else:
-                self.module.fail_json(msg=f"Error executing query: {error_message}")
-        except Exception as e:
-            if not fail_on_error:
-                return None
-            self.module.fail_json(msg=f"Unexpected error executing query: {str(e)}")
+                self._fail(f"Object does not exist: {error_message}")
+        elif "unknown setting" in error_message:
+            self._fail(f"Unknown setting: {error_message}")
+        elif "already exists" in error_message:
+            self._fail(f"Object already exists: {error_message}")
+        elif "permission denied" in error_message:
+            self._fail(f"Permission denied: {error_message}")
+        elif "syntax error" in error_message:
+            self._fail(f"SQL syntax error: {error_message}")
+        else:
+            self._fail(f"Error executing query: {error_message}")
+
+    def execute_query_iter(self, query, params=None, fail_on_error=True, system_tables=False, itersize=256):
+        """
+        Execute a SQL query and yield the result rows
+
+        Rows are converted in batches of itersize, so the whole result is never
+        materialized as a Python list. Server-side (named) cursors would need
+        WITH HOLD in autocommit mode, which CockroachDB does not support, so the
+        batches are read from the client-side result.
+
+        Args:
+            query: The SQL query to execute
+            params: The parameters for the query (optional)
+            fail_on_error: Whether to fail with an error or yield no rows (default: True)
+            system_tables: Whether this query is accessing system tables (default: False)
+            itersize: Number of rows converted per batch (default: 256)
+        """
+        if not self.conn:
+            self.connect()
+
+        cursor = self.conn.cursor()
+        try:
+            try:
+                cursor.execute(query, params or ())
+            except psycopg2.Error as e:
+                self._query_error(e, fail_on_error, system_tables)
+                return
+
+            rows = cursor.fetchmany(itersize)
+            while rows:
+                for row in rows:
+                    yield row
+                rows = cursor.fetchmany(itersize)
+        finally:
+            cursor.close()
+
+    def open_pool(self, maxconn):
+        """
+        Open a pool of connections for queries running in worker threads
+
+        Args:
+            maxconn: The maximum number of connections held by the pool
+        """
+        if not HAS_PSYCOPG2:
+            self.module.fail_json(msg=missing_required_lib("psycopg2"), exception=COCKROACHDB_IMP_ERR)
+
+        if self.pool is None:
+            self.pool = ThreadedConnectionPool(1, maxconn, **self._connection_params())
+        return self.pool
+
+    @contextmanager
+    def pooled_helper(self):
+        """
+        Borrow a pooled connection wrapped in its own helper
+
+        The borrowed helper raises CockroachDBError instead of failing the module,
+        so it is safe to use from worker threads. The connection is returned to
+        the pool when the context exits.
+        """
+        conn = self.pool.getconn()
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        helper = CockroachDBHelper(self.module)
+        helper.conn = conn
+        helper.raise_errors = True
+        try:
+            yield helper
+        finally:
+            helper.conn = None
+            self.pool.putconn(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        # Also runs when the module exits through fail_json, which raises SystemExit
+        self.close()
+        return False
 
     def close(self):
         """
-        Close the database connection
+        Close the database connection and any pooled connections
         """
         if self.conn:
             self.conn.close()
             self.conn = None
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
+
+    def quote_identifier(self, *names):
+        """
+        Quote a possibly qualified identifier for use in the text of a query
+
+        Args:
+            names: The parts of the identifier, e.g. database, schema and table names
+
+        Returns:
+            The quoted parts joined with dots
+        """
+        if not self.conn:
+            self.connect()
+        return sql.Identifier(*names).as_string(self.conn)
 
     def connect_to_database(self, db_name):
         """
@@ -190,47 +386,33 @@ class CockroachDBHelper(object):
         if not self.database_exists(db_name):
             self.module.fail_json(msg=f"Database '{db_name}' does not exist")
 
-        # Close existing connection if any
-        self.close()
-
-        # Connect to the specified database
-        conn_params = {
-            'host': self.host,
-            'port': self.port,
-            'user': self.user,
-            'password': self.password,
-            'database': db_name,
-            'sslmode': self.ssl_mode
-        }
-
-        # Add SSL parameters if provided
-        if self.ssl_cert:
-            conn_params['sslcert'] = self.ssl_cert
-
-        if self.ssl_key:
-            conn_params['sslkey'] = self.ssl_key
-
-        if self.ssl_rootcert:
-            conn_params['sslrootcert'] = self.ssl_rootcert
-
-        try:
-            self.conn = psycopg2.connect(**conn_params)
-            self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        # Switch the session of an open connection instead of reconnecting,
+        # which would pay for a new TCP/TLS handshake
+        if self.conn and not self.conn.closed:
+            if db_name != self.database:
+                self.execute_query(sql.SQL("USE {}").format(sql.Identifier(db_name)), fetch=False)
+                self.database = db_name
             return self.conn
-        except Exception as e:
-            self.module.fail_json(msg=f"Unable to connect to database '{db_name}': {str(e)}")
+
+        self.database = db_name
+        return self.connect()
 
     def database_exists(self, db_name):
         """
         Check if a database exists
+
+        The answer is remembered for the lifetime of the helper. create_database
+        and drop_database keep it up to date.
         """
-        result = self.execute_query(
-            "SELECT 1 FROM pg_database WHERE datname = %s",
-            [db_name],
-            fail_on_error=False,
-            system_tables=True
-        )
-        return bool(result)
+        if db_name not in self._database_exists_cache:
+            result = self.execute_query(
+                "SELECT 1 FROM pg_database WHERE datname = %s",
+                [db_name],
+                fail_on_error=False,
+                system_tables=True
+            )
+            self._database_exists_cache[db_name] = bool(result)
+        return self._database_exists_cache[db_name]
 
     def role_exists(self, role_name):
         """
@@ -250,6 +432,7 @@ class CockroachDBHelper(object):
         """
         if not self.database_exists(db_name):
             self.execute_query("CREATE DATABASE %s" % db_name)
+            self._database_exists_cache[db_name] = True
             return True
         return False
 
@@ -259,6 +442,10 @@ class CockroachDBHelper(object):
         """
         if self.database_exists(db_name):
             self.execute_query("DROP DATABASE %s" % db_name)
+            self._database_exists_cache[db_name] = False
+            self._table_exists_cache = {
+                key: exists for key, exists in self._table_exists_cache.items() if key[2] != db_name
+            }
             return True
         return False
 
@@ -482,14 +669,34 @@ class CockroachDBHelper(object):
 
         return result
 
+    def get_all_tables(self, database):
+        """
+        Get the names of the public tables of a database
+
+        Args:
+            database: The name of the database
+
+        Returns:
+            List of table names ordered by name
+        """
+        # Read the database's own information_schema, whatever the session database is
+        result = self.execute_query(sql.SQL("""
+            SELECT table_name
+            FROM {}.information_schema.tables
+            WHERE table_schema = 'public' AND table_catalog = %s
+            ORDER BY table_name
+        """).format(sql.Identifier(database)), [database])
+
+        return [row[0] for row in result or []]
+
     def get_database_size(self, db_name):
         """
         Get the size of a database in bytes
         """
-        result = self.execute_query("""
-            SELECT sum(range_size)
-            FROM [SHOW RANGES FROM DATABASE %s]
-        """ % db_name)
+        result = self.execute_query(sql.SQL("""
+            SELECT sum(range_size)::INT8
+            FROM [SHOW RANGES FROM DATABASE {} WITH DETAILS]
+        """).format(sql.Identifier(db_name)))
 
         if result and result[0][0]:
             return result[0][0]
@@ -498,39 +705,205 @@ class CockroachDBHelper(object):
     def get_table_size(self, table_name, database=None):
         """
         Get the size of a table in bytes
+
+        Args:
+            table_name: The name of the table
+            database: Optional database name, qualifying the table instead of switching databases
         """
         if database:
-            self.execute_query("USE %s" % database)
+            table = sql.Identifier(database, 'public', table_name)
+        else:
+            table = sql.Identifier(table_name)
 
-        result = self.execute_query("""
-            SELECT sum(range_size)
-            FROM [SHOW RANGES FROM TABLE %s]
-        """ % table_name)
+        result = self.execute_query(sql.SQL("""
+            SELECT sum(range_size)::INT8
+            FROM [SHOW RANGES FROM TABLE {} WITH DETAILS]
+        """).format(table))
 
         if result and result[0][0]:
             return result[0][0]
         return 0
 
+    def get_database_sizes(self, database):
+        """
+        Get the size in bytes of a database and of each of its public tables with a single query
+
+        A range holding several tables counts once towards the database size
+        and towards the size of every table it holds.
+
+        Args:
+            database: The name of the database
+
+        Returns:
+            Tuple of the database size and a dictionary mapping table names to sizes,
+            containing only tables that have ranges
+        """
+        result = self.execute_query(sql.SQL("""
+            WITH ranges AS MATERIALIZED (
+                SELECT schema_name, table_name, range_id, range_size
+                FROM [SHOW RANGES FROM DATABASE {} WITH TABLES, DETAILS]
+            )
+            SELECT NULL::STRING, sum(range_size)::INT8
+            FROM (SELECT DISTINCT range_id, range_size FROM ranges)
+            UNION ALL
+            SELECT table_name, sum(range_size)::INT8
+            FROM ranges
+            WHERE schema_name = 'public'
+            GROUP BY table_name
+        """).format(sql.Identifier(database)))
+
+        database_size = 0
+        table_sizes = {}
+        for table_name, size in result or []:
+            if table_name is None:
+                database_size = size or 0
+            else:
+                table_sizes[table_name] = size or 0
+        return database_size, table_sizes
+
+    def get_all_indexes(self, database):
+        """
+        Get the indexes of every table of a database with a single query
+
+        SHOW INDEXES FROM DATABASE returns one row per index column, which are
+        grouped into one dictionary per index.
+
+        Args:
+            database: The name of the database
+
+        Returns:
+            Dictionary mapping table names to lists of index dictionaries ordered by name
+        """
+        # Rows are grouped as they are fetched, so the full result is never held at once
+        rows = self.execute_query_iter(sql.SQL("""
+            SELECT
+                table_name,
+                index_name,
+                non_unique,
+                column_name,
+                storing,
+                implicit
+            FROM
+                [SHOW INDEXES FROM DATABASE {}]
+            ORDER BY
+                table_name,
+                index_name,
+                seq_in_index
+        """).format(sql.Identifier(database)))
+
+        indexes = defaultdict(list)
+        for (table_name, index_name), index_rows in groupby(rows, key=itemgetter(0, 1)):
+            index_rows = list(index_rows)
+            indexes[table_name].append({
+                'name': index_name,
+                'is_unique': not index_rows[0][2],
+                # Implicit columns, e.g. the primary key suffix of a secondary index, are not listed
+                'columns': [row[3] for row in index_rows if not row[4] and not row[5]],
+                'storing': [row[3] for row in index_rows if row[4]],
+            })
+        return dict(indexes)
+
+    def get_build_info(self):
+        """
+        Get the build information of the node serving the connection
+
+        The fields (Version, Organization, ClusterID, ...) are read from
+        crdb_internal.node_build_info once and cached on the helper.
+
+        Returns:
+            Dictionary mapping field names to values, empty when the table cannot be queried
+        """
+        if self._build_info is None:
+            result = self.execute_query(
+                "SELECT field, value FROM crdb_internal.node_build_info",
+                fail_on_error=False,
+                system_tables=True
+            )
+            self._build_info = dict(result) if result else {}
+        return self._build_info
+
     def get_version(self):
         """
         Get CockroachDB version
         """
+        version = self.get_build_info().get('Version')
+        if version:
+            return version.lstrip('v')
+
         result = self.execute_query("SELECT version()")
         if result:
-            # Parse version string to extract the actual version number
-            version_str = result[0][0]
-            version_match = re.search(r'CockroachDB v([0-9.]+)', version_str)
-            if version_match:
-                return version_match.group(1)
+            return parse_version(result[0][0])
         return None
 
     def is_enterprise(self):
         """
         Check if this is an enterprise edition of CockroachDB
         """
+        build_info = self.get_build_info()
+        if 'Organization' in build_info:
+            return bool(build_info['Organization'])
+
         result = self.execute_query("SHOW CLUSTER SETTING cluster.organization")
         return bool(result and result[0][0])
 
+    def get_cluster_info(self):
+        """
+        Get version, edition, cluster ID and node count in a single round-trip
+
+        Falls back to one query per value if the combined query fails, e.g. when
+        one of the crdb_internal tables does not exist in this CockroachDB version.
+
+        Returns:
+            Dictionary with version, enterprise, id and node_count keys
+        """
+        result = self.execute_query("""
+            SELECT
+                version(),
+                (SELECT value FROM crdb_internal.cluster_settings WHERE variable = 'cluster.organization'),
+                (SELECT cluster_id FROM crdb_internal.cluster_info LIMIT 1),
+                (SELECT count(*) FROM crdb_internal.gossip_nodes)
+        """, fail_on_error=False, system_tables=True)
+
+        if result:
+            version_str, organization, cluster_id, node_count = result[0]
+            return {
+                'version': parse_version(version_str),
+                'enterprise': bool(organization),
+                'id': cluster_id or 'unknown',
+                'node_count': node_count or 1
+            }
+
+        # Version, edition and cluster ID all come from the same cached build information
+        cluster_info = {
+            'version': self.get_version(),
+            'enterprise': self.is_enterprise()
+        }
+
+        cluster_id = self.get_build_info().get('ClusterID')
+        if not cluster_id:
+            # Using system_tables=True to handle case where crdb_internal.cluster_info may not exist
+            cluster_id_result = self.execute_query(
+                "SELECT cluster_id FROM crdb_internal.cluster_info LIMIT 1",
+                fail_on_error=False,
+                system_tables=True
+            )
+            if cluster_id_result:
+                cluster_id = cluster_id_result[0][0]
+        cluster_info['id'] = cluster_id or 'unknown'  # Default value if table doesn't exist or query fails
+
+        # Using system_tables=True to handle case where crdb_internal.gossip_nodes may not exist
+        node_count_result = self.execute_query(
+            "SELECT count(*) FROM crdb_internal.gossip_nodes",
+            fail_on_error=False,
+            system_tables=True
+        )
+        if node_count_result and node_count_result[0][0]:
+            cluster_info['node_count'] = node_count_result[0][0]
+        else:
+            cluster_info['node_count'] = 1  # Default to single node if table doesn't exist or query fails
+
+        return cluster_info
+
     def table_exists(self, table_name, schema=None, database=None):
         """
         Check if a table exists
@@ -539,10 +912,18 @@ class CockroachDBHelper(object):
             table_name: The name of the table
             schema: Optional schema name (default: 'public')
             database: Optional database name
+
+        When the database is given, the answer is remembered for the lifetime of
+        the helper. Without it, the answer depends on the session database and is
+        not remembered.
         """
+        cache_key = (table_name, schema, database)
+        if database and cache_key in self._table_exists_cache:
+            return self._table_exists_cache[cache_key]
+
         params = [table_name]
         query = """
-            SELECT 1 FROM information_schema.tables
+            SELECT 1 FROM {}information_schema.tables
             WHERE table_name = %s AND table_type = 'BASE TABLE'
         """
 
@@ -553,13 +934,20 @@ class CockroachDBHelper(object):
         if database:
             query += " AND table_catalog = %s"
             params.append(database)
+            # Read the database's own information_schema, whatever the session database is
+            query = sql.SQL(query).format(sql.SQL("{}.").format(sql.Identifier(database)))
+        else:
+            query = query.format("")
 
-        return bool(self.execute_query(
+        exists = bool(self.execute_query(
             query,
             params,
             fail_on_error=False,
             system_tables=True
         ))
+        if database:
+            self._table_exists_cache[cache_key] = exists
+        return exists
 
     def view_exists(self, view_name, schema=None, database=None):
         """
@@ -652,29 +1040,65 @@ class CockroachDBHelper(object):
             }
         return None
 
+    def get_all_partition_info(self, database):
+        """
+        Get partition information for every partitioned table of a database with a single query
+
+        Args:
+            database: The name of the database
+
+        Returns:
+            Dictionary mapping partitioned table names to their partition information,
+            or None when crdb_internal.table_partitions does not exist
+        """
+        result = self.execute_query(sql.SQL("""
+            SELECT
+                table_name,
+                partition_name,
+                partition_method,
+                partition_expression,
+                partition_value
+            FROM
+                {}.crdb_internal.table_partitions
+            ORDER BY
+                table_name,
+                partition_ordinal_position
+        """).format(sql.Identifier(database)), missing_ok=True)
+
+        if result is None:
+            return None
+
+        partitions = defaultdict(list)
+        for row in result:
+            partitions[row[0]].append(row[1:])
+        return {table_name: build_partition_info(rows) for table_name, rows in partitions.items()}
+
     def get_partition_info(self, table_name, database=None):
         """
         Get partition information for a table
+
+        Args:
+            table_name: The name of the table
+            database: Optional database name, qualifying the table instead of switching databases
         """
-        if database:
-            self.execute_query("USE %s" % database)
+        catalog = sql.SQL("{}.").format(sql.Identifier(database)) if database else sql.SQL("")
 
         # Try to get partition information from the CockroachDB metadata
         try:
             # First check if the table is partitioned
-            partition_query = """
+            partition_query = sql.SQL("""
                 SELECT
                     partition_name,
                     partition_method,
                     partition_expression,
                     partition_value
                 FROM
-                    crdb_internal.table_partitions
+                    {}crdb_internal.table_partitions
                 WHERE
                     table_name = %s
                 ORDER BY
                     partition_ordinal_position
-            """
+            """).format(catalog)
 
             result = self.execute_query(partition_query, [table_name])
 
@@ -682,40 +1106,13 @@ class CockroachDBHelper(object):
                 # No partitioning information found
                 return None
 
-            partitions = []
-            partition_type = None
-            partition_columns = None
-
-            for row in result:
-                part_name = row[0]
-                part_method = row[1]  # HASH, RANGE, LIST
-                part_expr = row[2]    # Columns used for partitioning
-                part_value = row[3]   # Values for the partition
-
-                # Extract column names from expression
-                if not partition_columns and part_expr:
-                    # Simple parsing, assumes format like: "region" or "(region, country)"
-                    columns_str = part_expr.strip('()')
-                    partition_columns = [col.strip() for col in columns_str.split(',')]
-
-                if not partition_type and part_method:
-                    partition_type = part_method
-
-                partitions.append({
-                    'name': part_name,
-                    'values': part_value,
-                })
-
-            return {
-                'partition_type': partition_type,
-                'partition_columns': partition_columns,
-                'partitions': partitions
-            }
+            return build_partition_info(result)
 
         except Exception:
             # If table_partitions view doesn't exist or other error, try to fall back to SHOW CREATE TABLE
             try:
-                create_table_result = self.execute_query("SHOW CREATE TABLE %s" % table_name)
+                qualified_name = sql.Identifier(database, 'public', table_name) if database else sql.Identifier(table_name)
+                create_table_result = self.execute_query(sql.SQL("SHOW CREATE TABLE {}").format(qualified_name))
 
                 if create_table_result and create_table_result[0][1]:
                     create_stmt = create_table_result[0][1]
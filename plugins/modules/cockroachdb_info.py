@@ -28,16 +28,58 @@ used for documentation, monitoring, or as input for other automation tasks.
 For full documentation, see the plugins/docs/cockroachdb_info.yml file
 """
 
+import json
+import os
+import tempfile
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from operator import itemgetter
 from ansible.module_utils.basic import AnsibleModule
 try:
     from ansible_collections.rpunt.cockroachdb.plugins.module_utils.cockroachdb import (
-        CockroachDBHelper
+        CockroachDBHelper,
+        CockroachDBError
     )
 except ImportError:
     # This is handled in the module
     pass
 
+try:
+    import orjson
+    from psycopg2.extras import register_default_json, register_default_jsonb
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Databases skipped when gathering tables, sizes and indexes
+SYSTEM_DATABASES = frozenset(('postgres', 'system'))
+
+# Upper bound on the connections opened to gather several databases in parallel
+MAX_PARALLEL_DATABASES = 8
+
+# Subsets gathered when neither gather_subset nor type is given
+DEFAULT_GATHER_SUBSET = ['cluster', 'databases', 'sizes']
+
+# Result keys filled by each subset
+SUBSET_RESULT_KEYS = {
+    'cluster': ('cluster',),
+    'databases': ('databases',),
+    'tables': ('tables', 'partitioned_tables'),
+    'sizes': ('sizes',),
+    'indexes': ('indexes',),
+    'roles': ('roles',),
+    'settings': ('settings',),
+}
+
+# Subsets whose result does not depend on the database and table options
+CLUSTER_WIDE_SUBSETS = ('cluster', 'roles', 'settings')
+
+# On-disk cache of gathered subsets, used when cache_ttl is set
+CACHE_PATH = os.path.join('~', '.ansible', 'cockroachdb_info.cache')
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
 ANSIBLE_METADATA = {
     "metadata_version": "1.1",
     "status": ["preview"],
@@ -54,10 +96,7 @@ options:
   gather_subset:
     description:
       - Specify which subset of information to gather
-    default:
-      - cluster
-      - databases
-      - sizes
+      - Defaults to C(cluster), C(databases) and C(sizes), or to just the subset given by I(type) when I(type) is set
     type: list
     elements: str
     choices:
@@ -79,6 +118,7 @@ options:
   type:
     description:
       - Shorthand to gather specific type of information (alternative to gather_subset)
+      - When combined with I(gather_subset), the type is added to the listed subsets
     type: str
     choices:
       - cluster
@@ -125,8 +165,17 @@ options:
     description:
       - Path to CA certificate file
     type: path
+  cache_ttl:
+    description:
+      - Number of seconds gathered subsets are cached in C(~/.ansible/cockroachdb_info.cache)
+      - Cached subsets are returned without querying the cluster until they expire
+      - Entries are keyed on host, port, user and subset, plus database and table for per-database subsets
+      - Set to 0 to disable the cache
+    default: 0
+    type: int
 requirements:
   - psycopg2
+  - orjson (optional, faster decoding of JSON query results)
 author:
   - "Ryan Punt (@rpunt)"
 """
@@ -276,10 +325,6 @@ indexes:
               description: Columns stored but not indexed
               type: list
               sample: ["last_login_date"]
-            index_type:
-              description: Type of index
-              type: str
-              sample: "BTREE"
 roles:
   description: List of roles in the cluster
   returned: when gather_subset includes roles
@@ -333,6 +378,263 @@ settings:
     server.time_until_store_dead: "5m0s"
 """
 
+
+def loads_json(data):
+    """
+    Decode a json or jsonb column with orjson, falling back to the json module.
+
+    orjson rejects some documents the json module accepts, e.g. numbers beyond
+    the range of a double from a DECIMAL aggregated into JSON.
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def gather_database(db, database, gather_subset, target_table=None):
+    """
+    Gather table, size and index information for a single database.
+
+    Args:
+        db: CockroachDBHelper whose connection is dedicated to this call
+        database: Name of the database to inspect
+        gather_subset: List of information subsets requested
+        target_table: Optional table to restrict table and index information to
+
+    Returns:
+        Dictionary with the tables, partitioned_tables, database_size, table_sizes
+        and indexes of the database, for the subsets that were requested
+    """
+    info = {}
+
+    # Every query names the database explicitly, so the session database is never switched
+    with_sizes = 'sizes' in gather_subset
+    with_indexes = 'indexes' in gather_subset
+    all_tables = []
+
+    if with_sizes or not target_table:
+        all_tables = db.get_all_tables(database)
+
+    tables = all_tables
+    if target_table and ('tables' in gather_subset or 'indexes' in gather_subset):
+        if not db.table_exists(target_table, database=database):
+            raise CockroachDBError(f"Table {target_table} does not exist in database {database}")
+        tables = [target_table]
+
+    if 'tables' in gather_subset:
+        info['tables'] = tables
+
+        # Check for partitioning information for all tables at once, or table by table
+        # when crdb_internal.table_partitions does not exist
+        all_partitions = db.get_all_partition_info(database)
+        partitioned_tables = {}
+        for table_name in tables:
+            if all_partitions is not None:
+                partition_info = all_partitions.get(table_name)
+            else:
+                partition_info = db.get_partition_info(table_name, database)
+            if partition_info:
+                partitioned_tables[table_name] = partition_info
+        info['partitioned_tables'] = partitioned_tables
+
+    if with_sizes:
+        # The database and table sizes are summed from the same ranges in one query
+        database_size, ranges_sizes = db.get_database_sizes(database)
+        info['database_size'] = database_size
+        info['table_sizes'] = {table_name: ranges_sizes.get(table_name, 0) for table_name in all_tables}
+
+    if with_indexes:
+        # The indexes of every table are read at once and grouped per table
+        indexes_by_table = db.get_all_indexes(database)
+        info['indexes'] = {table: indexes_by_table[table] for table in tables if table in indexes_by_table}
+
+    return info
+
+
+def list_databases(db, ordered=True):
+    """
+    List the databases of the cluster.
+
+    Args:
+        db: CockroachDBHelper connected to the cluster
+        ordered: Whether to sort the databases by name, which is only needed when they are returned
+
+    Returns:
+        List of database names
+    """
+    databases_result = db.execute_query("SELECT datname FROM pg_database WHERE NOT datistemplate")
+    databases = [row[0] for row in databases_result or []]
+    return sorted(databases) if ordered else databases
+
+
+def resolve_databases(db, target_database, databases=None):
+    """
+    Resolve the databases whose tables, sizes and indexes are gathered.
+
+    Args:
+        db: CockroachDBHelper connected to the cluster
+        target_database: Database to restrict the information to, if any
+        databases: Databases already listed by the databases subset, if it was gathered
+
+    Returns:
+        List of database names
+
+    Raises:
+        CockroachDBError: If the target database does not exist
+    """
+    if target_database:
+        # The databases subset already tells whether the target database exists
+        if databases is not None:
+            database_found = target_database in databases
+        else:
+            database_found = db.database_exists(target_database)
+
+        if not database_found:
+            raise CockroachDBError(f"Database {target_database} does not exist")
+        return [target_database]
+
+    if databases is not None:
+        return databases
+    return list_databases(db, ordered=False)
+
+
+def gather_roles(db):
+    """
+    Gather the roles of the cluster.
+
+    Args:
+        db: CockroachDBHelper connected to the cluster
+
+    Returns:
+        List of role dictionaries ordered by name
+    """
+    # The server returns all roles as a single JSON array, decoded by psycopg2
+    roles_result = db.execute_query("""
+        SELECT
+            json_agg(json_build_object(
+                'name', rolname,
+                'superuser', rolsuper,
+                'inherit', rolinherit,
+                'can_login', rolcanlogin,
+                'can_create_db', rolcreatedb
+            ))
+        FROM
+            pg_roles
+    """)
+
+    roles = (roles_result[0][0] if roles_result else None) or []
+    return sorted(roles, key=itemgetter('name'))
+
+
+def gather_settings(db):
+    """
+    Gather the cluster settings that have a value.
+
+    Args:
+        db: CockroachDBHelper connected to the cluster
+
+    Returns:
+        Dictionary mapping setting names to their values
+    """
+    # Only the name and value are returned, the type and description columns are not transferred
+    return dict(db.execute_query_iter(
+        "SELECT variable, value FROM crdb_internal.cluster_settings WHERE value IS NOT NULL"
+    ))
+
+
+def gather_pooled_database(db, database, gather_subset, target_table=None):
+    """
+    Run gather_database on a connection borrowed from the helper's pool.
+    """
+    with db.pooled_helper() as pooled_db:
+        return gather_database(pooled_db, database, gather_subset, target_table)
+
+
+def cache_key(params, subset):
+    """
+    Build the cache key of a subset for the connection and scope of this invocation.
+
+    Args:
+        params: Module parameters
+        subset: Name of the subset
+
+    Returns:
+        Key of the subset in the cache file
+    """
+    parts = [params['host'], str(params['port']), params['user'], subset]
+    if subset not in CLUSTER_WIDE_SUBSETS:
+        parts += [params.get('database') or '', params.get('table') or '']
+    return ':'.join(parts)
+
+
+def load_cache(path):
+    """
+    Read the unexpired entries of the cache file.
+
+    A missing or unreadable cache file, or one holding an entry that is not an
+    {'expires': number, 'value': dict} mapping, is treated as an empty cache.
+
+    Args:
+        path: Path of the cache file
+
+    Returns:
+        Dictionary mapping cache keys to {'expires', 'value'} entries
+    """
+    try:
+        with open(path, encoding='utf-8') as cache_file:
+            entries = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(entries, dict):
+        return {}
+
+    for entry in entries.values():
+        if not (isinstance(entry, dict) and isinstance(entry.get('expires'), (int, float))
+                and isinstance(entry.get('value'), dict)):
+            return {}
+
+    now = time.time()
+    return {key: entry for key, entry in entries.items() if entry['expires'] > now}
+
+
+def save_cache(path, entries):
+    """
+    Atomically replace the cache file with the given entries.
+
+    The file is created readable by the current user only. Caching is best
+    effort: entries that cannot be serialized, caches larger than
+    CACHE_MAX_BYTES and write errors leave the previous file in place.
+
+    Args:
+        path: Path of the cache file
+        entries: Dictionary mapping cache keys to {'expires', 'value'} entries
+    """
+    try:
+        data = json.dumps(entries)
+    except (TypeError, ValueError):
+        return
+
+    if len(data) > CACHE_MAX_BYTES:
+        return
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # mkstemp creates the file with 0600 permissions
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.cockroachdb_info.')
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+            cache_file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        os.unlink(tmp_path)
+
+
 def main():
     """
     Main entry point for the cockroachdb_info module.
@@ -346,7 +648,6 @@ def main():
         gather_subset=dict(
             type='list',
             elements='str',
-            default=['cluster', 'databases', 'sizes'],
             choices=['cluster', 'databases', 'tables', 'roles', 'sizes', 'settings', 'indexes']
         ),
         type=dict(
@@ -363,6 +664,7 @@ def main():
         ssl_cert=dict(type='path'),
         ssl_key=dict(type='path'),
         ssl_rootcert=dict(type='path'),
+        cache_ttl=dict(type='int', default=0),
     )
 
     module = AnsibleModule(
@@ -371,311 +673,150 @@ def main():
     )
 
     gather_subset = module.params['gather_subset']
-    # If 'type' parameter is provided, add it to the gather_subset
-    if module.params.get('type'):
-        gather_subset = list(set(gather_subset + [module.params.get('type')]))
+    subset_type = module.params.get('type')
+    if gather_subset is None:
+        # A lone 'type' gathers only that subset instead of adding to the defaults
+        gather_subset = [subset_type] if subset_type else list(DEFAULT_GATHER_SUBSET)
+    elif subset_type:
+        gather_subset = list(set(gather_subset + [subset_type]))
     target_database = module.params.get('database')
 
     result = {}
 
-    db = CockroachDBHelper(module)
-
-    try:
-        # Connect to the CockroachDB server
-        db.connect()
-
-        # Gather cluster information
-        if 'cluster' in gather_subset:
-            cluster_info = {}
-
-            # Get version
-            cluster_info['version'] = db.get_version()
-
-            # Check if enterprise
-            cluster_info['enterprise'] = db.is_enterprise()
-
-            # Get cluster ID - using system_tables=True to handle case where crdb_internal.cluster_info may not exist
-            cluster_id_result = db.execute_query(
-                "SELECT cluster_id FROM crdb_internal.cluster_info LIMIT 1",
-                fail_on_error=False,
-                system_tables=True
-            )
-            if cluster_id_result and cluster_id_result[0][0]:
-                cluster_info['id'] = cluster_id_result[0][0]
-            else:
-                cluster_info['id'] = 'unknown'  # Default value if table doesn't exist or query fails
-
-            # Get node count - using system_tables=True to handle case where crdb_internal.gossip_nodes may not exist
-            node_count_result = db.execute_query(
-                "SELECT count(*) FROM crdb_internal.gossip_nodes",
-                fail_on_error=False,
-                system_tables=True
-            )
-            if node_count_result and node_count_result[0][0]:
-                cluster_info['node_count'] = node_count_result[0][0]
-            else:
-                cluster_info['node_count'] = 1  # Default to single node if table doesn't exist or query fails
-
-            result['cluster'] = cluster_info
-
-        # Gather database information
-        if 'databases' in gather_subset:
-            databases_result = db.execute_query(
-                "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname"
-            )
-            databases = [db[0] for db in databases_result] if databases_result else []
-
-            # Filter by target database if provided
-            if target_database and target_database in databases:
-                databases = [target_database]
-
-            result['databases'] = databases
-
-        # Gather table information
-        if 'tables' in gather_subset:
-            tables_by_db = {}
-            partitioned_tables_by_db = {}
-
+    # Serve unexpired subsets from the cache and only gather the others
+    cache_ttl = module.params['cache_ttl']
+    cache_path = os.path.expanduser(CACHE_PATH)
+    cache = load_cache(cache_path) if cache_ttl > 0 else {}
+    for subset in gather_subset:
+        entry = cache.get(cache_key(module.params, subset))
+        if entry is not None:
+            result.update(entry['value'])
+    if cache:
+        gather_subset = [subset for subset in gather_subset if cache_key(module.params, subset) not in cache]
+
+        # Everything was cached, there is no need to connect at all
+        if not gather_subset:
+            module.exit_json(**result)
+
+    with CockroachDBHelper(module) as db:
+        try:
+            # Connect to the CockroachDB server
+            db.connect()
+
+            # Decode json/jsonb columns (e.g. json_agg payloads) of this connection with orjson
+            if HAS_ORJSON:
+                register_default_json(conn_or_curs=db.conn, loads=loads_json)
+                register_default_jsonb(conn_or_curs=db.conn, loads=loads_json)
+
+            # Failed queries raise CockroachDBError from here on, so that they can be handled per subset
+            db.raise_errors = True
+
+            # Gather database information
+            if 'databases' in gather_subset:
+                databases = list_databases(db)
+
+                # Filter by target database if provided
+                if target_database and target_database in databases:
+                    databases = [target_database]
+
+                result['databases'] = databases
+
+            # Resolve the databases to inspect once for the tables, sizes and indexes subsets
             databases_to_check = []
-            if target_database:
-                if db.database_exists(target_database):
-                    databases_to_check = [target_database]
-                else:
-                    module.fail_json(msg=f"Database {target_database} does not exist")
-            elif 'databases' in result:
-                databases_to_check = result['databases']
-            else:
-                databases_result = db.execute_query(
-                    "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname"
-                )
-                databases_to_check = [db[0] for db in databases_result] if databases_result else []
+            if set(gather_subset) & {'tables', 'sizes', 'indexes'}:
+                databases_to_check = resolve_databases(db, target_database, result.get('databases'))
 
+            # Gather tables, sizes and indexes for each database. When there are several, they are
+            # gathered on pooled connections while the cluster-wide subsets use the primary connection.
+            databases_to_gather = [database for database in databases_to_check if database not in SYSTEM_DATABASES]
             target_table = module.params.get('table')
-
-            for database in databases_to_check:
-                # Skip system databases when listing tables
-                if database in ['postgres', 'system']:
-                    continue
-
-                # Connect to the database
-                db.execute_query(f"USE {database}")
-
-                # Get tables
-                tables_result = None
-                if target_table:
-                    if db.table_exists(target_table):
-                        tables_result = [[target_table]]
-                    else:
-                        module.fail_json(msg=f"Table {target_table} does not exist in database {database}")
-                else:
-                    tables_result = db.execute_query(
-                        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name"
+            database_info = {database: {} for database in databases_to_gather}
+            executor = None
+            futures = {}
+
+            if len(databases_to_gather) > 1:
+                max_workers = min(MAX_PARALLEL_DATABASES, len(databases_to_gather))
+                db.open_pool(max_workers)
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                futures = {
+                    executor.submit(gather_pooled_database, db, database, gather_subset, target_table): database
+                    for database in databases_to_gather
+                }
+
+            try:
+                # A cluster-wide subset that cannot be read is reported as a warning instead of failing the others
+                cluster_wide_gatherers = {
+                    'cluster': db.get_cluster_info,
+                    'roles': partial(gather_roles, db),
+                    'settings': partial(gather_settings, db),
+                }
+                for subset in CLUSTER_WIDE_SUBSETS:
+                    if subset in gather_subset:
+                        try:
+                            result[subset] = cluster_wide_gatherers[subset]()
+                        except CockroachDBError as e:
+                            module.warn(f"Unable to gather {subset} information: {e}")
+
+                if len(databases_to_gather) == 1:
+                    database_info[databases_to_gather[0]].update(
+                        gather_database(db, databases_to_gather[0], gather_subset, target_table)
                     )
 
-                if tables_result:
-                    tables = [table[0] for table in tables_result]
-                    tables_by_db[database] = tables
-
-                    # Check for partitioning information
-                    partitioned_tables = {}
-                    for table_name in tables:
-                        partition_info = db.get_partition_info(table_name)
-                        if partition_info:
-                            partitioned_tables[table_name] = partition_info
-
-                    if partitioned_tables:
-                        partitioned_tables_by_db[database] = partitioned_tables
-                else:
-                    tables_by_db[database] = []
-
-            result['tables'] = tables_by_db
-
-            # Include partitioned tables information if any
-            if partitioned_tables_by_db:
-                result['partitioned_tables'] = partitioned_tables_by_db
-
-        # Gather role information
-        if 'roles' in gather_subset:
-            roles_result = db.execute_query("""
-                SELECT
-                    rolname,
-                    rolsuper,
-                    rolinherit,
-                    rolcanlogin,
-                    rolcreatedb
-                FROM
-                    pg_roles
-                ORDER BY
-                    rolname
-            """)
-
-            roles = []
-            if roles_result:
-                for role in roles_result:
-                    roles.append({
-                        'name': role[0],
-                        'superuser': role[1],
-                        'inherit': role[2],
-                        'can_login': role[3],
-                        'can_create_db': role[4]
-                    })
-
-            result['roles'] = roles
-
-        # Gather size information
-        if 'sizes' in gather_subset:
-            sizes = {
-                'databases': {},
-                'tables': {}
+                for future in as_completed(futures):
+                    database_info[futures[future]].update(future.result())
+            finally:
+                # Let running workers finish before failing or closing the pool
+                if executor:
+                    executor.shutdown(wait=True)
+
+            # Gather table information
+            if 'tables' in gather_subset:
+                tables_by_db = {}
+                partitioned_tables_by_db = {}
+
+                for database in databases_to_gather:
+                    tables_by_db[database] = database_info[database]['tables']
+                    if database_info[database]['partitioned_tables']:
+                        partitioned_tables_by_db[database] = database_info[database]['partitioned_tables']
+
+                result['tables'] = tables_by_db
+
+                # Include partitioned tables information if any
+                if partitioned_tables_by_db:
+                    result['partitioned_tables'] = partitioned_tables_by_db
+
+            # Gather size information
+            if 'sizes' in gather_subset:
+                sizes = {
+                    'databases': {},
+                    'tables': {}
+                }
+
+                for database in databases_to_gather:
+                    sizes['databases'][database] = database_info[database]['database_size']
+                    if database_info[database]['table_sizes']:
+                        sizes['tables'][database] = database_info[database]['table_sizes']
+
+                result['sizes'] = sizes
+
+            # Gather index information
+            if 'indexes' in gather_subset:
+                result['indexes'] = {database: database_info[database]['indexes'] for database in databases_to_gather}
+
+        except Exception as e:
+            module.fail_json(msg=str(e), exception=traceback.format_exc())
+
+    if cache_ttl > 0 and gather_subset:
+        expires = time.time() + cache_ttl
+        for subset in gather_subset:
+            if SUBSET_RESULT_KEYS[subset][0] not in result:
+                # Not gathered, e.g. skipped with a warning
+                continue
+            cache[cache_key(module.params, subset)] = {
+                'expires': expires,
+                'value': {key: result[key] for key in SUBSET_RESULT_KEYS[subset] if key in result}
             }
-
-            databases_to_check = []
-            if target_database:
-                if db.database_exists(target_database):
-                    databases_to_check = [target_database]
-                else:
-                    module.fail_json(msg=f"Database {target_database} does not exist")
-            elif 'databases' in result:
-                databases_to_check = result['databases']
-            else:
-                databases_result = db.execute_query(
-                    "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname"
-                )
-                databases_to_check = [db[0] for db in databases_result] if databases_result else []
-
-            for database in databases_to_check:
-                # Skip system databases when gathering sizes
-                if database in ['postgres', 'system']:
-                    continue
-
-                # Get database size
-                sizes['databases'][database] = db.get_database_size(database)
-
-                # Get table sizes
-                db.execute_query(f"USE {database}")
-                tables_result = db.execute_query("""
-                    SELECT
-                        table_name
-                    FROM
-                        information_schema.tables
-                    WHERE
-                        table_schema = 'public'
-                    ORDER BY
-                        table_name
-                """)
-
-                if tables_result:
-                    sizes['tables'][database] = {}
-                    for table in tables_result:
-                        table_name = table[0]
-                        sizes['tables'][database][table_name] = db.get_table_size(table_name)
-
-            result['sizes'] = sizes
-
-        # Gather cluster settings
-        if 'settings' in gather_subset:
-            settings_result = db.execute_query("SHOW ALL CLUSTER SETTINGS")
-
-            settings = {}
-            if settings_result:
-                for setting in settings_result:
-                    if setting[0] and setting[1] is not None:
-                        settings[setting[0]] = setting[1]
-
-            result['settings'] = settings
-
-        # Gather index information
-        if 'indexes' in gather_subset or module.params.get('type') == 'indexes':
-            indexes_by_db = {}
-
-            databases_to_check = []
-            if target_database:
-                if db.database_exists(target_database):
-                    databases_to_check = [target_database]
-                else:
-                    module.fail_json(msg=f"Database {target_database} does not exist")
-            elif 'databases' in result:
-                databases_to_check = result['databases']
-            else:
-                databases_result = db.execute_query(
-                    "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname"
-                )
-                databases_to_check = [db[0] for db in databases_result] if databases_result else []
-
-            target_table = module.params.get('table')
-
-            for database in databases_to_check:
-                # Skip system databases when gathering indexes
-                if database in ['postgres', 'system']:
-                    continue
-
-                # Connect to the database
-                db.execute_query(f"USE {database}")
-                indexes_by_db[database] = {}
-
-                # Get tables in this database
-                tables_to_check = []
-                if target_table:
-                    if db.table_exists(target_table):
-                        tables_to_check = [target_table]
-                    else:
-                        module.fail_json(msg=f"Table {target_table} does not exist in database {database}")
-                else:
-                    tables_result = db.execute_query(
-                        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name"
-                    )
-                    if tables_result:
-                        tables_to_check = [table[0] for table in tables_result]
-
-                # Get indexes for each table
-                for table in tables_to_check:
-                    indexes_result = db.execute_query(f"""
-                        SELECT
-                            index_name,
-                            is_unique,
-                            column_names,
-                            storing_names,
-                            index_type
-                        FROM
-                            [SHOW INDEXES FROM {table}]
-                        ORDER BY
-                            index_name
-                    """)
-
-                    if indexes_result:
-                        indexes_by_db[database][table] = []
-                        for idx in indexes_result:
-                            # Convert column names from string representation to list
-                            column_names = idx[2]
-                            if column_names.startswith('{') and column_names.endswith('}'):
-                                column_names = column_names[1:-1].split(',')
-                            else:
-                                column_names = [column_names]
-
-                            # Convert storing names from string representation to list
-                            storing_names = idx[3]
-                            if storing_names:
-                                if storing_names.startswith('{') and storing_names.endswith('}'):
-                                    storing_names = storing_names[1:-1].split(',')
-                                else:
-                                    storing_names = [storing_names]
-                            else:
-                                storing_names = []
-
-                            indexes_by_db[database][table].append({
-                                'name': idx[0],
-                                'is_unique': idx[1],
-                                'columns': column_names,
-                                'storing': storing_names,
-                                'index_type': idx[4]
-                            })
-
-            result['indexes'] = indexes_by_db
-
-    except Exception as e:
-        module.fail_json(msg=str(e), exception=traceback.format_exc())
-    finally:
-        db.close()
+        save_cache(cache_path, cache)
 
     module.exit_json(**result)
 
@@ -18,6 +18,8 @@ The documentation for this module is maintained in the plugins/docs/cockroachdb_
 import datetime
 import traceback
 import re
+from collections import ChainMap
+from functools import lru_cache
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
 try:
@@ -25,6 +27,7 @@ try:
         CockroachDBHelper,
         COCKROACHDB_IMP_ERR,
         HAS_PSYCOPG2,
+        is_valid_identifier,
     )
 except ImportError:
     # This is handled in the module
@@ -78,6 +81,12 @@ options:
       - USE WITH CAUTION - this will reset ALL settings, including critical ones
     type: bool
     default: false
+  debug:
+    description:
+      - Include per-parameter comparison details and the detected setting types in the C(debug) return value
+      - Useful when troubleshooting why a parameter is or isn't reported as changed
+    type: bool
+    default: false
   host:
     description:
       - Database host address
@@ -251,12 +260,44 @@ reset_all:
   type: bool
   sample: true
 debug:
-  description: Debug information to help with troubleshooting
+  description:
+    - Debug information to help with troubleshooting
+    - C(comparison_values), C(setting_types_available) and the byte size parameter types are only included when I(debug=true)
   returned: always
   type: dict
   sample: {"requested_parameters": {"sql.defaults.distsql": "on"}, "profile_used": null, "scope": "cluster", "reset_all": false}
 """
 
+# Pre-compiled patterns used by the duration and byte size normalizers
+_DURATION_COMPLEX_RE = re.compile(r'(\d+(?:\.\d+)?)([a-z]+)')
+_DURATION_SIMPLE_RE = re.compile(r'^(\d+(?:\.\d+)?)([a-z]+)$')
+_BYTE_SIZE_WS_RE = re.compile(r'\s+')
+_BYTE_INT_ZERO_RE = re.compile(r'(\d+)\.0+([kmgt]i?b)')
+_BYTE_FRAC_ZERO_RE = re.compile(r'(\d+\.\d+?)0+([kmgt]i?b)')
+
+# Byte size settings that are always compared as type 'z' (critical for idempotency)
+_BYTE_SIZE_PARAMS = frozenset({
+    'kv.snapshot_rebalance.max_rate',
+    'kv.snapshot_recovery.max_rate',
+    'kv.bulk_io_write.max_rate',
+})
+
+# String spellings accepted as true for boolean settings
+_TRUTHY = frozenset({'true', 't', 'yes', 'y', '1', 'on'})
+
+# Seconds per duration unit suffix
+_DURATION_UNITS = {
+    'ns': 1e-9,
+    'us': 1e-6,
+    'µs': 1e-6,
+    'ms': 1e-3,
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400,
+}
+
+
 # Helper function to normalize time duration strings or objects
 def normalize_duration(duration_val):
     """
@@ -268,67 +309,40 @@ def normalize_duration(duration_val):
     if isinstance(duration_val, datetime.timedelta):
         return duration_val.total_seconds()
 
-    # Handle string durations
+    # Handle string durations; anything else (including bare numbers) is not a duration
     if not isinstance(duration_val, str):
         return None
 
-    # Handle complex duration formats like "1h30m" or "2h15m30s"
-    # This regex matches patterns like 1h, 30m, 2h15m30s, etc.
-    complex_pattern = r'(?:(\d+(?:\.\d+)?)([a-z]+))'
-    matches = re.findall(complex_pattern, duration_val.lower())
-
-    if matches:
-        total_seconds = 0.0
-        for value, unit in matches:
-            value = float(value)
-            # Convert to seconds based on unit
-            if unit == 'ns':
-                total_seconds += value / 1_000_000_000
-            elif unit == 'us' or unit == 'µs':
-                total_seconds += value / 1_000_000
-            elif unit == 'ms':
-                total_seconds += value / 1_000
-            elif unit == 's':
-                total_seconds += value
-            elif unit == 'm':
-                total_seconds += value * 60
-            elif unit == 'h':
-                total_seconds += value * 3600
-            elif unit == 'd':
-                total_seconds += value * 86400
-            else:
-                # Unrecognized unit, return None
-                return None
-        return total_seconds
+    return _duration_seconds(duration_val)
 
-    # If not a complex format, check for simple format
-    simple_pattern = r'^(\d+(?:\.\d+)?)([a-z]+)$'
-    match = re.match(simple_pattern, duration_val.lower())
 
-    if not match:
-        return None
+@lru_cache(maxsize=512)
+def _duration_seconds(duration_str):
+    """Seconds represented by a duration string, or None if it can't be parsed"""
+    # Fast path for the common single-component form like "5m" or "300ms"
+    match = _DURATION_SIMPLE_RE.match(duration_str)
+    if match:
+        value, unit = match.groups()
+        multiplier = _DURATION_UNITS.get(unit)
+        if multiplier is None:
+            return None
+        return float(value) * multiplier
 
-    value, unit = match.groups()
-    value = float(value)
-
-    # Convert to seconds based on unit
-    if unit == 'ns':
-        return value / 1_000_000_000
-    elif unit == 'us' or unit == 'µs':
-        return value / 1_000_000
-    elif unit == 'ms':
-        return value / 1_000
-    elif unit == 's':
-        return value
-    elif unit == 'm':
-        return value * 60
-    elif unit == 'h':
-        return value * 3600
-    elif unit == 'd':
-        return value * 86400
-    else:
+    # Handle complex duration formats like "1h30m" or "2h15m30s"
+    # This regex matches patterns like 1h, 30m, 2h15m30s, etc.
+    matches = _DURATION_COMPLEX_RE.findall(duration_str.lower())
+    if not matches:
         return None
 
+    total_seconds = 0.0
+    for value, unit in matches:
+        multiplier = _DURATION_UNITS.get(unit)
+        if multiplier is None:
+            # Unrecognized unit, return None
+            return None
+        total_seconds += float(value) * multiplier
+    return total_seconds
+
 # Helper function to compare duration values
 def durations_equal(duration1, duration2):
     """
@@ -366,19 +380,23 @@ def normalize_byte_size(size_val):
     - "1.5 GiB" -> "1.5gib" (preserves actual decimal values)
     """
     if isinstance(size_val, str) and size_val.strip():  # Check if it's a non-empty string
-        # Remove spaces and convert to lowercase for comparison
-        normalized = re.sub(r'\s+', '', size_val.lower())
+        return _normalized_byte_size(size_val)
+    return None
 
-        # Handle integer values with decimal points (e.g., "1.0gib" -> "1gib")
-        # Match whole numbers with decimal point and zero(s) after
-        normalized = re.sub(r'(\d+)\.0+([kmgt]i?b)', r'\1\2', normalized)
 
-        # Handle decimal fractions with trailing zeros (e.g., "1.50gib" -> "1.5gib")
-        # This preserves the real decimal part while removing trailing zeros
-        normalized = re.sub(r'(\d+\.\d+?)0+([kmgt]i?b)', r'\1\2', normalized)
+@lru_cache(maxsize=512)
+def _normalized_byte_size(size_str):
+    """Canonical lowercase, space-free form of a non-empty byte size string"""
+    # Remove spaces and convert to lowercase for comparison
+    normalized = _BYTE_SIZE_WS_RE.sub('', size_str.lower())
 
-        return normalized
-    return None
+    # Handle integer values with decimal points (e.g., "1.0gib" -> "1gib")
+    # Match whole numbers with decimal point and zero(s) after
+    normalized = _BYTE_INT_ZERO_RE.sub(r'\1\2', normalized)
+
+    # Handle decimal fractions with trailing zeros (e.g., "1.50gib" -> "1.5gib")
+    # This preserves the real decimal part while removing trailing zeros
+    return _BYTE_FRAC_ZERO_RE.sub(r'\1\2', normalized)
 
 # Helper function to compare byte size values
 def byte_sizes_equal(size1, size2):
@@ -396,41 +414,156 @@ def byte_sizes_equal(size1, size2):
     # Fallback to string comparison if normalization fails
     return str(size1) == str(size2)
 
-# Get CockroachDB cluster setting types for type-based comparisons
-def get_setting_types(db_helper):
-    """Get a dictionary of parameter names to their types from CockroachDB"""
-    setting_types = {}
-
-    # Define known byte size parameters (critical for idempotency)
-    byte_size_params = [
-        'kv.snapshot_rebalance.max_rate',
-        'kv.snapshot_recovery.max_rate',
-        'kv.bulk_io_write.max_rate'
-    ]
-
+# Get CockroachDB cluster setting types and values for type-based comparisons
+def get_setting_snapshot(db_helper):
+    """Get dictionaries of parameter names to their types and to their current values from CockroachDB"""
     # Force known byte size parameters to always have type 'z'
-    for param in byte_size_params:
-        setting_types[param] = 'z'  # z = byte size
+    setting_types = {param: 'z' for param in _BYTE_SIZE_PARAMS}  # z = byte size
+    setting_values = {}
 
-    # Get setting types directly from crdb_internal.cluster_settings
+    # Get setting types and values directly from crdb_internal.cluster_settings
     # CockroachDB provides types as single letter codes:
     # 'b' (boolean), 'd' (duration), 'f' (float), 'i' (integer), 'z' (byte size), etc.
     try:
-        query = "SELECT variable, type FROM crdb_internal.cluster_settings"
+        query = "SELECT variable, type, value FROM crdb_internal.cluster_settings"
         results = db_helper.execute_query(query)
 
         if results:
-            for variable, setting_type in results:
-                # Store the type (lowercase for consistency)
-                setting_types[variable] = setting_type.lower()
-
-                # Force byte-size types to be 'z'
-                if 'byte' in str(setting_type).lower():
-                    setting_types[variable] = 'z'
+            # Store the type lowercase for consistency, forcing byte-size types to be 'z'
+            lowered = ((variable, setting_type.lower()) for variable, setting_type, _ in results)
+            setting_types.update({
+                variable: 'z' if 'byte' in setting_type else setting_type
+                for variable, setting_type in lowered
+            })
+            setting_values = {variable: value for variable, _, value in results}
     except Exception:
         pass  # If query fails, we'll still have our known byte size parameters
 
-    return setting_types
+    return setting_types, setting_values
+
+def _to_bool(value):
+    """Interpret a boolean setting value, which may be a bool or a string like 'on' or 'false'"""
+    return value if isinstance(value, bool) else str(value).lower() in _TRUTHY
+
+
+# Type-based comparators: each takes the requested and current values plus their
+# str() forms and returns (is_changed, extra debug information)
+def _compare_byte_size(value, current_value, str_value, str_current):
+    """Compare byte size (z) settings"""
+    # Use the dedicated byte size comparison function
+    is_changed = not byte_sizes_equal(value, current_value)
+    return is_changed, {
+        'normalized_requested': normalize_byte_size(str_value),
+        'normalized_current': normalize_byte_size(str_current),
+        'reason': 'byte_size_comparison (type-based)',
+    }
+
+
+def _compare_duration(value, current_value, str_value, str_current):
+    """Compare duration (d) settings"""
+    is_changed = not durations_equal(value, current_value)
+    return is_changed, {
+        'normalized_seconds_requested': normalize_duration(value),
+        'normalized_seconds_current': normalize_duration(current_value),
+        'reason': 'duration_comparison (type-based)',
+    }
+
+
+def _compare_bool(value, current_value, str_value, str_current):
+    """Compare boolean (b) settings"""
+    value_bool = _to_bool(value)
+    current_bool = _to_bool(current_value)
+    return value_bool != current_bool, {
+        'normalized_requested': str(value_bool),
+        'normalized_current': str(current_bool),
+        'reason': 'boolean_comparison (type-based)',
+    }
+
+
+def _compare_int(value, current_value, str_value, str_current):
+    """Compare integer (i) settings"""
+    try:
+        # Convert both to integers for comparison
+        int_value = int(float(str_value)) if not isinstance(value, bool) else (1 if value else 0)
+        int_current = int(float(str_current)) if not isinstance(current_value, bool) else (1 if current_value else 0)
+    except (ValueError, TypeError):
+        # Fallback to string comparison if conversion fails
+        return str_current != str_value, {'reason': 'integer_comparison_fallback (type-based)'}
+
+    return int_value != int_current, {
+        'normalized_requested': str(int_value),
+        'normalized_current': str(int_current),
+        'reason': 'integer_comparison (type-based)',
+    }
+
+
+def _compare_float(value, current_value, str_value, str_current):
+    """Compare float (f) settings"""
+    try:
+        # Convert both to floats for comparison
+        float_value = float(str_value) if not isinstance(value, bool) else (1.0 if value else 0.0)
+        float_current = float(str_current) if not isinstance(current_value, bool) else (1.0 if current_value else 0.0)
+    except (ValueError, TypeError):
+        # Fallback to string comparison if conversion fails
+        return str_current != str_value, {'reason': 'float_comparison_fallback (type-based)'}
+
+    # Use a small epsilon for floating point comparison
+    epsilon = max(abs(float_value), abs(float_current)) * 0.0000001 or 0.0000001
+    return abs(float_value - float_current) > epsilon, {
+        'normalized_requested': str(float_value),
+        'normalized_current': str(float_current),
+        'reason': 'float_comparison (type-based)',
+    }
+
+
+def _compare_string(value, current_value, str_value, str_current):
+    """Default comparison for other setting types"""
+    return str_current != str_value, {'reason': 'string_comparison (type-based)'}
+
+
+_COMPARATORS = {
+    'z': _compare_byte_size,
+    'd': _compare_duration,
+    'b': _compare_bool,
+    'i': _compare_int,
+    'f': _compare_float,
+}
+
+
+
+def compare_setting(value, current_value, setting_type=None):
+    """
+    Compare a requested setting value with the current one.
+
+    Args:
+        value: The requested value
+        current_value: The current value, None when it could not be read
+        setting_type: Type code of the cluster setting (z, d, b, i, f, ...), None to
+                      only compare identical raw values
+
+    Returns:
+        Tuple of whether the setting changes and a dictionary of debug information
+        including the reason of the decision
+    """
+    # Handle case where we couldn't read the current value
+    if current_value is None:
+        return True, {'reason': 'current_value is None'}
+
+    # String forms used by the comparators
+    str_value = str(value)
+    str_current = str(current_value)
+
+    # Identical raw values are unchanged whatever the setting type, so skip
+    # normalization. Booleans always go through the boolean comparator.
+    if not isinstance(value, bool) and str_value == str_current:
+        return False, {'reason': 'raw_string_equal_fast_path'}
+
+    # Use type-based comparison if available
+    if setting_type is not None:
+        handler = _COMPARATORS.get(setting_type, _compare_string)
+        return handler(value, current_value, str_value, str_current)
+
+    return False, {}
 
 # Predefined parameter profiles for various workloads
 PARAMETER_PROFILES = {
@@ -512,6 +645,7 @@ def main():
         custom_profiles=dict(type='dict', default={}),
         scope=dict(type='str', default='cluster', choices=['cluster', 'session']),
         reset_all=dict(type='bool', default=False),
+        debug=dict(type='bool', default=False),
         host=dict(type='str', default='localhost'),
         port=dict(type='int', default=26257),
         user=dict(type='str', default='root'),
@@ -537,14 +671,14 @@ def main():
     custom_profiles = module.params['custom_profiles']
     scope = module.params['scope']
     reset_all = module.params['reset_all']
+    debug = module.params['debug']
 
-    # Merge built-in profiles with custom profiles
-    all_profiles = PARAMETER_PROFILES.copy()
-    all_profiles.update(custom_profiles)
+    # Layer custom profiles over the built-in ones; without any, use the built-ins directly
+    all_profiles = ChainMap(custom_profiles, PARAMETER_PROFILES) if custom_profiles else PARAMETER_PROFILES
 
     # Validate profile exists if specified
     if profile and profile not in all_profiles:
-        available_profiles = list(all_profiles.keys())
+        available_profiles = list(all_profiles)
         module.fail_json(
             msg=f"Profile '{profile}' not found. Available profiles: {available_profiles}. "
                 f"You can define custom profiles using the 'custom_profiles' parameter."
@@ -553,10 +687,10 @@ def main():
     result = {
         'changed': False,
         'parameters': {},
-        'debug': {
-            'comparison_values': {}
-        }
+        'debug': {}
     }
+    if debug:
+        result['debug']['comparison_values'] = {}
 
     if profile:
         result['profile'] = profile
@@ -570,17 +704,19 @@ def main():
         # Connect to the database
         db.connect()
 
-        # Get CockroachDB setting types for type-based comparison
+        # Get CockroachDB setting types and current values for type-based comparison
         setting_types = {}
+        current_values = {}
         if scope == 'cluster':  # Only fetch types for cluster settings
-            setting_types = get_setting_types(db)
-            result['debug']['setting_types_available'] = len(setting_types) > 0
+            setting_types, current_values = get_setting_snapshot(db)
 
-            # Print debug info about critical byte size parameters
-            byte_size_params = ['kv.snapshot_rebalance.max_rate', 'kv.snapshot_recovery.max_rate', 'kv.bulk_io_write.max_rate']
-            for param in byte_size_params:
-                if param in setting_types:
-                    result['debug'][f'{param}_type'] = setting_types[param]
+            if debug:
+                result['debug']['setting_types_available'] = len(setting_types) > 0
+
+                # Print debug info about critical byte size parameters
+                for param in _BYTE_SIZE_PARAMS:
+                    if param in setting_types:
+                        result['debug'][f'{param}_type'] = setting_types[param]
 
         # Handle profile application
         if profile:
@@ -602,8 +738,15 @@ def main():
 
         # Handle setting parameters
         if parameters:
+            # Parameter names are spliced into the statements, so validate each dotted part
+            for name in parameters:
+                if not all(is_valid_identifier(part) for part in name.split('.')):
+                    module.fail_json(msg=f"Invalid parameter name: {name}")
+
             reset_list = []
             changed_params = {}
+            # SET/RESET statements and their bound values, run once every parameter has been compared
+            pending_writes = []
 
             for name, value in parameters.items():
                 if value is None:
@@ -614,177 +757,86 @@ def main():
                     else:
                         query = f"RESET {name}"
 
-                    if not module.check_mode:
-                        db.execute_query(query)
-
+                    pending_writes.append((name, query, ()))
                     result['changed'] = True
                     # Add to changed parameters with None value to indicate reset
                     changed_params[name] = None
                 else:
-                    # Set parameter value
-                    # Convert boolean values properly for SQL
-                    if isinstance(value, bool):
-                        sql_value = "true" if value else "false"
-                    else:
-                        sql_value = f"'{value}'" if isinstance(value, str) else str(value)
-
                     # Get the current value of the parameter before making any changes
-                    if scope == 'cluster':
-                        current_value_query = f"SHOW CLUSTER SETTING {name}"
-                    else:
-                        current_value_query = f"SHOW {name}"
-
-                    current_value = None
-                    try:
-                        # Set fail_on_error to False to handle unknown settings gracefully
-                        current_value_result = db.execute_query(current_value_query, fail_on_error=False)
-                        if current_value_result:
-                            current_value = current_value_result[0][0]
-                    except Exception as ex:
-                        # Parameter might not exist, or we can't read it
-                        if "unknown setting" in str(ex).lower():
-                            module.fail_json(msg=f"Unknown setting: '{name}'. The specified parameter does not exist in this version of CockroachDB. Please check the parameter name or refer to the CockroachDB documentation for valid parameters.")
-                        # For other exceptions, we'll continue and treat as a new parameter
-
-                    # Compare values in a consistent way to ensure idempotency
-                    is_changed = False
-
-                    # Convert any non-serializable values to strings for debug info
-                    requested_value = str(value) if value is not None else None
-                    current_value_str = str(current_value) if current_value is not None else None
-
-                    comparison_info = {
-                        'name': name,
-                        'requested_type': type(value).__name__,
-                        'requested_value': requested_value,
-                        'current_type': type(current_value).__name__ if current_value is not None else 'None',
-                        'current_value': current_value_str,
-                    }
-
-                    # Handle case where we couldn't read the current value
-                    if current_value is None:
-                        is_changed = True
-                        comparison_info['reason'] = 'current_value is None'
-
-                    # Use type-based comparison if available
-                    elif scope == 'cluster' and name in setting_types:
-                        setting_type = setting_types[name]
-                        comparison_info['setting_type'] = setting_type
-
-                        # Byte size comparison (z)
-                        if setting_type == 'z':
-                            # Use the dedicated byte size comparison function
-                            is_changed = not byte_sizes_equal(value, current_value)
-
-                            # Add normalized values to debug info
-                            norm_value = normalize_byte_size(str(value))
-                            norm_current = normalize_byte_size(str(current_value))
-
-                            comparison_info['normalized_requested'] = norm_value
-                            comparison_info['normalized_current'] = norm_current
-                            comparison_info['reason'] = 'byte_size_comparison (type-based)'
-
-                        # Duration comparison (d)
-                        elif setting_type == 'd':
-                            is_changed = not durations_equal(value, current_value)
-                            seconds_value = normalize_duration(value)
-                            seconds_current = normalize_duration(current_value)
-                            comparison_info['normalized_seconds_requested'] = seconds_value
-                            comparison_info['normalized_seconds_current'] = seconds_current
-                            comparison_info['reason'] = 'duration_comparison (type-based)'
-
-                        # Boolean comparison (b)
-                        elif setting_type == 'b':
-                            if isinstance(value, bool) and isinstance(current_value, str):
-                                current_bool = current_value.lower() in ('true', 't', 'yes', 'y', '1', 'on')
-                                is_changed = value != current_bool
-                                comparison_info['normalized_current'] = str(current_bool)
-                            elif isinstance(value, str) and isinstance(current_value, bool):
-                                value_bool = value.lower() in ('true', 't', 'yes', 'y', '1', 'on')
-                                is_changed = value_bool != current_value
-                                comparison_info['normalized_requested'] = str(value_bool)
-                            else:
-                                str_current = str(current_value).lower()
-                                str_value = str(value).lower()
-                                is_changed = str_current != str_value
-                            comparison_info['reason'] = 'boolean_comparison (type-based)'
-
-                        # Integer comparison (i)
-                        elif setting_type == 'i':
-                            try:
-                                # Convert both to integers for comparison
-                                int_value = int(float(str(value))) if not isinstance(value, bool) else (1 if value else 0)
-                                int_current = int(float(str(current_value))) if not isinstance(current_value, bool) else (1 if current_value else 0)
-
-                                is_changed = int_value != int_current
-                                comparison_info['normalized_requested'] = str(int_value)
-                                comparison_info['normalized_current'] = str(int_current)
-                                comparison_info['reason'] = 'integer_comparison (type-based)'
-                            except (ValueError, TypeError):
-                                # Fallback to string comparison if conversion fails
-                                str_current = str(current_value)
-                                str_value = str(value)
-                                is_changed = str_current != str_value
-                                comparison_info['reason'] = 'integer_comparison_fallback (type-based)'
-
-                        # Float comparison (f)
-                        elif setting_type == 'f':
-                            try:
-                                # Convert both to floats for comparison
-                                float_value = float(str(value)) if not isinstance(value, bool) else (1.0 if value else 0.0)
-                                float_current = float(str(current_value)) if not isinstance(current_value, bool) else (1.0 if current_value else 0.0)
-
-                                # Use a small epsilon for floating point comparison
-                                epsilon = max(abs(float_value), abs(float_current)) * 0.0000001 or 0.0000001
-                                is_changed = abs(float_value - float_current) > epsilon
-
-                                comparison_info['normalized_requested'] = str(float_value)
-                                comparison_info['normalized_current'] = str(float_current)
-                                comparison_info['reason'] = 'float_comparison (type-based)'
-                            except (ValueError, TypeError):
-                                # Fallback to string comparison if conversion fails
-                                str_current = str(current_value)
-                                str_value = str(value)
-                                is_changed = str_current != str_value
-                                comparison_info['reason'] = 'float_comparison_fallback (type-based)'
-
-                        # Default comparison for other types
+                    current_value = current_values.get(name)
+                    if name not in current_values:
+                        if scope == 'cluster':
+                            current_value_query = f"SHOW CLUSTER SETTING {name}"
                         else:
-                            str_current = str(current_value)
-                            str_value = str(value)
-                            is_changed = str_current != str_value
-                            comparison_info['reason'] = 'string_comparison (type-based)'
+                            current_value_query = f"SHOW {name}"
+
+                        try:
+                            # Set fail_on_error to False to handle unknown settings gracefully
+                            current_value_result = db.execute_query(current_value_query, fail_on_error=False)
+                            if current_value_result:
+                                current_value = current_value_result[0][0]
+                        except Exception as ex:
+                            # Parameter might not exist, or we can't read it
+                            if "unknown setting" in str(ex).lower():
+                                module.fail_json(msg=f"Unknown setting: '{name}'. The specified parameter does not exist in this version of CockroachDB. Please check the parameter name or refer to the CockroachDB documentation for valid parameters.")
+                            # For other exceptions, we'll continue and treat as a new parameter
+
+                    # Compare values in a consistent way to ensure idempotency, by type for cluster settings
+                    setting_type = setting_types.get(name) if scope == 'cluster' else None
+                    is_changed, extra_info = compare_setting(value, current_value, setting_type)
 
                     # Add debugging information
-                    comparison_info['is_changed'] = is_changed
-                    comparison_info['python_type_current'] = str(type(current_value).__name__) if current_value is not None else 'None'
-                    comparison_info['python_type_requested'] = str(type(value).__name__) if value is not None else 'None'
-                    result['debug']['comparison_values'][name] = comparison_info
+                    if debug:
+                        comparison_info = {
+                            'name': name,
+                            'requested_type': type(value).__name__,
+                            'requested_value': str(value),
+                            'current_type': type(current_value).__name__ if current_value is not None else 'None',
+                            'current_value': str(current_value) if current_value is not None else None,
+                            'is_changed': is_changed,
+                        }
+                        if setting_type is not None:
+                            comparison_info['setting_type'] = setting_type
+                        comparison_info.update(extra_info)
+                        result['debug']['comparison_values'][name] = comparison_info
 
                     # If a change is needed, execute it
                     if is_changed:
+                        # Pass the value as a query parameter so psycopg2 quotes it
+                        # (booleans are sent as true/false)
                         if scope == 'cluster':
-                            query = f"SET CLUSTER SETTING {name} = {sql_value}"
+                            query = f"SET CLUSTER SETTING {name} = %s"
                         else:
-                            query = f"SET {name} = {sql_value}"
-
-                        if not module.check_mode:
-                            try:
-                                # Will raise an exception if setting doesn't exist
-                                db.execute_query(query, fail_on_error=True)
-                                result['changed'] = True
-                                # Add to changed parameters
-                                changed_params[name] = value
-                            except Exception as ex:
-                                if "unknown setting" in str(ex).lower():
-                                    module.fail_json(msg=f"Unknown setting: '{name}'. The specified parameter does not exist in this version of CockroachDB. Please check the parameter name or refer to the CockroachDB documentation for valid parameters.")
-                                # Re-raise other exceptions
-                                raise
-                        else:
-                            # In check mode, we assume it would work
-                            result['changed'] = True
-                            # Add to changed parameters
-                            changed_params[name] = value
+                            query = f"SET {name} = %s"
+
+                        # Written after the loop; in check mode, we assume it would work
+                        pending_writes.append((name, query, (value,)))
+                        result['changed'] = True
+                        # Add to changed parameters
+                        changed_params[name] = value
+
+            if pending_writes and not module.check_mode:
+                # Session variables can be changed together in one round-trip. CockroachDB
+                # rejects SET/RESET CLUSTER SETTING inside a multi-statement transaction,
+                # so cluster settings are always written one statement at a time.
+                batched = None
+                if scope == 'session' and len(pending_writes) > 1:
+                    batch_query = ";\n".join(query for _, query, _ in pending_writes)
+                    batch_params = tuple(param for _, _, params in pending_writes for param in params)
+                    batched = db.execute_query(batch_query, batch_params, fail_on_error=False, fetch=False)
+
+                # Run the statements individually so a failure names the offending setting
+                if not batched:
+                    for name, query, params in pending_writes:
+                        try:
+                            # Will raise an exception if setting doesn't exist
+                            db.execute_query(query, params, fail_on_error=True)
+                        except Exception as ex:
+                            if "unknown setting" in str(ex).lower():
+                                module.fail_json(msg=f"Unknown setting: '{name}'. The specified parameter does not exist in this version of CockroachDB. Please check the parameter name or refer to the CockroachDB documentation for valid parameters.")
+                            # Re-raise other exceptions
+                            raise
+
             # Update result with actual changed parameters
             result['parameters'] = changed_params
 
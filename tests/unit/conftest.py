@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import types
+
+# Root of the collection, i.e. the directory holding galaxy.yml
+COLLECTION_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Modules import their module_utils as ansible_collections.rpunt.cockroachdb. When the
+# repository is not checked out under an ansible_collections/rpunt/cockroachdb tree,
+# map that namespace onto the checkout so the modules can be imported by the tests.
+try:
+    import ansible_collections.rpunt.cockroachdb  # noqa: F401
+except ImportError:
+    parent = None
+    for name, path in (('ansible_collections', None),
+                       ('ansible_collections.rpunt', None),
+                       ('ansible_collections.rpunt.cockroachdb', COLLECTION_ROOT)):
+        package = sys.modules.get(name)
+        if package is None:
+            package = types.ModuleType(name)
+            package.__path__ = []
+            sys.modules[name] = package
+        if path:
+            package.__path__ = [path]
+        if parent is not None:
+            setattr(parent, name.rsplit('.', 1)[1], package)
+        parent = package
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import sys
+import time
+
+import psycopg2
+import pytest
+
+# Add the module and module_utils directories to the path
+sys.path.insert(0, 'plugins/modules')
+sys.path.insert(0, 'plugins/module_utils')
+
+import cockroachdb_info
+from cockroachdb import CockroachDBHelper, CockroachDBError, sql
+from cockroachdb_info import load_cache, save_cache
+
+
+class MockModule:
+    def __init__(self):
+        self.params = {}
+
+
+class MockCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.conn.queries.append(query)
+        if self.conn.error:
+            raise self.conn.error
+        self.rows = list(self.conn.rows)
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class MockConnection:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+        self.queries = []
+
+    def cursor(self):
+        return MockCursor(self)
+
+
+class UndefinedTableError(psycopg2.Error):
+    pgcode = '42P01'
+
+
+class InsufficientPrivilegeError(psycopg2.Error):
+    pgcode = '42501'
+
+
+def make_helper(rows, error=None):
+    db = CockroachDBHelper(MockModule())
+    db.conn = MockConnection(rows, error)
+    db.raise_errors = True
+    return db
+
+
+def test_execute_query_missing_ok_returns_none_for_undefined_table():
+    db = make_helper([], UndefinedTableError('relation "crdb_internal.table_partitions" does not exist'))
+
+    assert db.execute_query('SELECT 1 FROM crdb_internal.table_partitions', missing_ok=True) is None
+
+
+def test_execute_query_missing_ok_raises_other_errors():
+    db = make_helper([], InsufficientPrivilegeError('user has no privilege'))
+
+    with pytest.raises(CockroachDBError):
+        db.execute_query('SELECT 1 FROM crdb_internal.table_partitions', missing_ok=True)
+
+
+# Rows as returned by SHOW INDEXES FROM DATABASE, one per index column and ordered by
+# table_name, index_name, seq_in_index: (table_name, index_name, non_unique, column_name, storing, implicit)
+SHOW_INDEXES_ROWS = [
+    ('orders', 'orders_pkey', False, 'id', False, False),
+    ('orders', 'orders_pkey', False, 'user_id', True, False),
+    ('orders', 'orders_pkey', False, 'total', True, False),
+    ('users', 'users_email_key', False, 'email', False, False),
+    ('users', 'users_email_key', False, 'id', False, True),
+    ('users', 'users_name_idx', True, 'last_name', False, False),
+    ('users', 'users_name_idx', True, 'first_name', False, False),
+    ('users', 'users_name_idx', True, 'last_login_date', True, False),
+    ('users', 'users_name_idx', True, 'id', False, True),
+    ('users', 'users_pkey', False, 'id', False, False),
+]
+
+
+def test_get_all_indexes_groups_index_columns():
+    db = make_helper(SHOW_INDEXES_ROWS)
+
+    assert db.get_all_indexes('shop') == {
+        'orders': [
+            {'name': 'orders_pkey', 'is_unique': True, 'columns': ['id'], 'storing': ['user_id', 'total']},
+        ],
+        'users': [
+            {'name': 'users_email_key', 'is_unique': True, 'columns': ['email'], 'storing': []},
+            {'name': 'users_name_idx', 'is_unique': False, 'columns': ['last_name', 'first_name'],
+             'storing': ['last_login_date']},
+            {'name': 'users_pkey', 'is_unique': True, 'columns': ['id'], 'storing': []},
+        ],
+    }
+
+
+def test_get_all_indexes_selects_show_indexes_columns():
+    db = make_helper([])
+
+    assert db.get_all_indexes('shop') == {}
+
+    query = db.conn.queries[0]
+    assert sql.Identifier('shop') in query.seq
+    query_text = ''.join(part.string for part in query.seq if isinstance(part, sql.SQL))
+    for column in ('non_unique', 'column_name', 'storing', 'implicit', 'seq_in_index'):
+        assert column in query_text
+
+
+def test_cache_hit(tmp_path):
+    path = str(tmp_path / 'info_cache.json')
+    entries = {'localhost:26257:root:roles': {'expires': time.time() + 60, 'value': {'roles': []}}}
+
+    save_cache(path, entries)
+
+    assert load_cache(path) == entries
+
+
+def test_cache_drops_expired_entries(tmp_path):
+    path = str(tmp_path / 'info_cache.json')
+    fresh = {'expires': time.time() + 60, 'value': {'roles': []}}
+    save_cache(path, {
+        'localhost:26257:root:roles': fresh,
+        'localhost:26257:root:settings': {'expires': time.time() - 1, 'value': {'settings': {}}},
+    })
+
+    assert load_cache(path) == {'localhost:26257:root:roles': fresh}
+
+
+@pytest.mark.parametrize('content', [
+    '{not json',
+    '[]',
+    json.dumps({'key': 'entry'}),
+    json.dumps({'key': {'expires': '9999999999', 'value': {}}}),
+    json.dumps({'key': {'expires': 9999999999, 'value': ['roles']}}),
+    json.dumps({'key': {'value': {}}}),
+])
+def test_cache_ignores_corrupt_file(tmp_path, content):
+    path = tmp_path / 'info_cache.json'
+    path.write_text(content)
+
+    assert load_cache(str(path)) == {}
+
+
+def test_cache_ignores_missing_file(tmp_path):
+    assert load_cache(str(tmp_path / 'missing.json')) == {}
+
+
+def test_cache_size_bound_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'info_cache.json')
+    entries = {'localhost:26257:root:roles': {'expires': time.time() + 60, 'value': {'roles': []}}}
+    save_cache(path, entries)
+
+    monkeypatch.setattr(cockroachdb_info, 'CACHE_MAX_BYTES', 100)
+    save_cache(path, {'localhost:26257:root:settings': {'expires': time.time() + 60, 'value': {'settings': {'a': 'b' * 200}}}})
+
+    assert load_cache(path) == entries
+
+
+@pytest.mark.skipif(not cockroachdb_info.HAS_ORJSON, reason='orjson is not installed')
+def test_loads_json_falls_back_to_json_module():
+    assert cockroachdb_info.loads_json('[{"name": "root", "superuser": true}]') == [{'name': 'root', 'superuser': True}]
+    assert cockroachdb_info.loads_json('[1e400]') == json.loads('[1e400]')
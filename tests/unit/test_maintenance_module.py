@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+# The module imports its module_utils through the collection namespace, see conftest.py
+from ansible_collections.rpunt.cockroachdb.plugins.modules import cockroachdb_maintenance
+
+
+# Like AnsibleModule, exit and fail with SystemExit so main() does not catch them as errors
+class ExitJson(SystemExit):
+    pass
+
+
+class FailJson(SystemExit):
+    pass
+
+
+class MockModule:
+    def __init__(self, params=None, check_mode=False):
+        self.params = params or {}
+        self.check_mode = check_mode
+        self.warnings = []
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+    def exit_json(self, **kwargs):
+        raise ExitJson(kwargs)
+
+    def fail_json(self, **kwargs):
+        raise FailJson(kwargs)
+
+
+def run_main(params):
+    """Run main() with the given parameters and return the exit or failure arguments"""
+    module = MockModule(params)
+    with patch.object(cockroachdb_maintenance, 'AnsibleModule', return_value=module), \
+            patch.object(cockroachdb_maintenance, 'CockroachDBHelper') as helper_class:
+        with pytest.raises((ExitJson, FailJson)) as exc_info:
+            cockroachdb_maintenance.main()
+    return exc_info.value.args[0], helper_class.return_value
+
+
+def test_operation_handlers_cover_documented_operations():
+    documentation = yaml.safe_load(cockroachdb_maintenance.DOCUMENTATION)
+    operations = documentation['options']['operation']['choices']
+
+    assert sorted(cockroachdb_maintenance.OPERATION_HANDLERS) == sorted(operations)
+
+
+def test_main_dispatches_to_operation_handler():
+    def handler(module, helper, result):
+        result['changed'] = True
+        result['queries'].append('SELECT 1')
+
+    with patch.dict(cockroachdb_maintenance.OPERATION_HANDLERS, {'node_status': handler}):
+        result, helper = run_main({'operation': 'node_status'})
+
+    assert result == {'changed': True, 'queries': ['SELECT 1']}
+    helper.connect.assert_called_once_with()
+    helper.conn.close.assert_called_once_with()
+
+
+def test_main_checks_required_params_before_connecting():
+    result, helper = run_main({'operation': 'gc', 'database': 'shop', 'table': 'orders', 'ttl': None})
+
+    assert result['msg'] == 'ttl is required for gc operation'
+    helper.connect.assert_not_called()
+
+
+@pytest.mark.parametrize('operation, params, msg', [
+    ('gc', {'database': None, 'table': 'orders', 'ttl': '1h'}, 'database is required for gc operation'),
+    ('schema_cleanup', {'database': ''}, 'database is required for schema_cleanup operation'),
+    ('node_decommission', {'node_id': None}, 'node_id is required for node_decommission operation'),
+    ('zone_config', {'zone_configs': None}, 'zone_configs is required for zone_config operation'),
+    ('zone_config', {'zone_configs': {'config': {}}}, 'zone_configs.target is required for zone_config operation'),
+    ('cancel_query', {'query_id': None}, 'query_id is required for cancel_query operation'),
+    ('cancel_session', {'session_id': None}, 'session_id is required for cancel_session operation'),
+    ('troubleshoot_query', {'troubleshoot_options': None},
+     'troubleshoot_options.query_text is required for troubleshoot_query operation'),
+    ('troubleshoot_query', {'troubleshoot_options': {'collect_trace': True}},
+     'troubleshoot_options.query_text is required for troubleshoot_query operation'),
+])
+def test_check_required_params_messages(operation, params, msg):
+    with pytest.raises(FailJson) as exc_info:
+        cockroachdb_maintenance.check_required_params(MockModule(params), operation)
+
+    assert exc_info.value.args[0]['msg'] == msg
+
+
+def test_check_required_params_accepts_complete_params():
+    params = {'zone_configs': {'target': 'DATABASE shop', 'config': {}}}
+
+    cockroachdb_maintenance.check_required_params(MockModule(params), 'zone_config')
+    cockroachdb_maintenance.check_required_params(MockModule({}), 'node_status')
+
+
+def test_node_decommission_node_not_found():
+    module = MockModule({'node_id': 7})
+    helper = MagicMock()
+    helper.execute_query.return_value = []
+    result = {'changed': False, 'queries': []}
+
+    cockroachdb_maintenance.run_node_decommission(module, helper, result)
+
+    assert result == {
+        'changed': False,
+        'queries': [],
+        'nodes': [{'id': 7, 'current_status': 'not_found', 'message': 'Node not found in cluster'}],
+    }
+    assert module.warnings == ['Node 7 not found in cluster']
+    helper.execute_query.assert_called_once()
+
+
+def test_gc_keeps_user_names_unquoted():
+    # Unquoted names are folded to lower case by CockroachDB, like names typed in a SQL shell
+    module = MockModule({'database': 'MyApp', 'table': 'public.Users', 'ttl': '2h'})
+    helper = MagicMock()
+    helper.execute_query.return_value = []
+    result = {'changed': False, 'queries': []}
+
+    cockroachdb_maintenance.run_gc(module, helper, result)
+
+    assert 'SHOW ZONE CONFIGURATION FOR TABLE MyApp.public.Users' in helper.execute_query.call_args_list[0][0][0]
+    assert ' '.join(result['queries'][0].split()) == 'ALTER TABLE MyApp.public.Users CONFIGURE ZONE USING gc.ttlseconds = 7200'
+    helper.quote_identifier.assert_not_called()
+
+
+def test_gc_rejects_invalid_identifier():
+    module = MockModule({'database': 'MyApp', 'table': 'Users; DROP TABLE x', 'ttl': '2h'})
+
+    with pytest.raises(FailJson) as exc_info:
+        cockroachdb_maintenance.run_gc(module, MagicMock(), {'changed': False, 'queries': []})
+
+    assert exc_info.value.args[0]['msg'] == 'Invalid identifier: Users; DROP TABLE x'
+
+
+def test_schema_cleanup_quotes_only_catalog_names():
+    module = MockModule({'database': 'MyApp'}, check_mode=True)
+    helper = MagicMock()
+    helper.quote_identifier.side_effect = lambda name: f'"{name}"'
+    helper.execute_query_iter.return_value = [
+        ('table', 'Temp_Orders', None),
+        ('index', 'Orders_Old', 'Orders'),
+        ('view', 'Report_Deprecated', None),
+    ]
+    result = {'changed': False, 'queries': []}
+
+    cockroachdb_maintenance.run_schema_cleanup(module, helper, result)
+
+    helper.connect_to_database.assert_called_once_with('MyApp')
+    assert result['queries'] == [
+        'DROP TABLE IF EXISTS MyApp.public."Temp_Orders"',
+        'DROP INDEX IF EXISTS MyApp.public."Orders"@"Orders_Old"',
+        'DROP VIEW IF EXISTS MyApp.public."Report_Deprecated"',
+    ]
+
+
+def test_troubleshoot_trace_batch_keeps_separators_out_of_comments():
+    module = MockModule({'troubleshoot_options': {
+        'query_text': 'SELECT * FROM orders -- recent orders',
+        'collect_explain': False,
+        'collect_trace': True,
+    }})
+    helper = MagicMock()
+    helper.raise_errors = True
+    helper.execute_query_iter.return_value = [('2025-01-01 00:00:00', None, None, None, 'query')]
+    result = {'changed': False, 'queries': []}
+
+    cockroachdb_maintenance.run_troubleshoot_query(module, helper, result)
+
+    batch = helper.execute_query.call_args_list[0][0][0]
+    assert batch == 'SET tracing = on;\nSELECT * FROM orders -- recent orders\n;\nSET tracing = off'
+    assert result['troubleshooting'] == {'execution_trace': '[2025-01-01 00:00:00] query'}
+    # The caller's error behavior is restored
+    assert helper.raise_errors is True
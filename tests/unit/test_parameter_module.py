@@ -264,3 +264,56 @@ def test_parameter_comparison_with_durations():
     for value in complex_values:
         is_changed = not durations_equal(value, complex_current)
         assert is_changed is False, f"Failed with complex format {value} vs {complex_current}"
+
+# Load the setting comparison, which has no mock implementation
+try:
+    from cockroachdb_parameter import compare_setting
+except ImportError:
+    compare_setting = None
+
+requires_compare_setting = pytest.mark.skipif(compare_setting is None, reason='cockroachdb_parameter cannot be imported')
+
+# Current values are strings, as read from crdb_internal.cluster_settings
+@requires_compare_setting
+@pytest.mark.parametrize('setting_type, value, current_value, is_changed', [
+    ('d', '5m', '5m0s', False),
+    ('d', '300s', '5m0s', False),
+    ('d', '10m', '5m0s', True),
+    ('z', '64MiB', '64 MiB', False),
+    ('z', '128 MiB', '64 MiB', True),
+    ('b', True, 'true', False),
+    ('b', 'on', 'true', False),
+    ('b', False, 'true', True),
+    ('i', '08', '8', False),
+    ('i', '8.0', '8', False),
+    ('i', 16, '8', True),
+    ('f', 0.5, '0.50', False),
+    ('f', '0.25', '0.5', True),
+    ('s', 'acme', 'Acme', True),
+])
+def test_compare_setting_by_type(setting_type, value, current_value, is_changed):
+    changed, info = compare_setting(value, current_value, setting_type)
+
+    assert changed is is_changed
+    assert info['reason'].endswith('(type-based)')
+
+@requires_compare_setting
+def test_compare_setting_raw_string_equal_fast_path():
+    for setting_type in ('d', 'z', 'i', 'f', 's', None):
+        assert compare_setting('5m0s', '5m0s', setting_type) == (False, {'reason': 'raw_string_equal_fast_path'})
+
+    # Booleans are always compared as booleans, even when their string forms match
+    changed, info = compare_setting(True, 'True', 'b')
+    assert changed is False
+    assert info['reason'] == 'boolean_comparison (type-based)'
+
+@requires_compare_setting
+def test_compare_setting_bool_with_off():
+    assert compare_setting(True, 'off', 'b')[0] is True
+    assert compare_setting(False, 'off', 'b')[0] is False
+    assert compare_setting('on', 'off', 'b')[0] is True
+    assert compare_setting('off', 'false', 'b')[0] is False
+
+@requires_compare_setting
+def test_compare_setting_without_current_value():
+    assert compare_setting('5m', None, 'd') == (True, {'reason': 'current_value is None'})